@@ -49,6 +49,7 @@ class ProductionRAGModule:
             self.collection_name = os.getenv("COLLECTION_NAME", "research_papers_prod")
             self.rag_top_k = int(os.getenv("RAG_TOP_K", "5"))
             self.chunk_size = int(os.getenv("CHUNK_SIZE", "500"))
+            self.embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
 
             # Validate required environment variables
             required_vars = ["QDRANT_URL", "QDRANT_API_KEY"]
@@ -120,7 +121,8 @@ class ProductionRAGModule:
         """Check if URL already exists in the vector database"""
         try:
             # Search for documents with this exact URL
-            search_results = self.qdrant_client.scroll(
+            search_results = await asyncio.to_thread(
+                self.qdrant_client.scroll,
                 collection_name=self.collection_name,
                 scroll_filter={
                     "must": [
@@ -147,8 +149,9 @@ class ProductionRAGModule:
                 logger.warning("Missing data in search results")
                 return
 
-            research_papers = []
-            processed_count = 0
+            # Collect every chunk first so they can be embedded in a single batched call
+            chunk_texts = []
+            chunk_payloads = []
             duplicate_count = 0
 
             for i, (header, link, snippet, content) in enumerate(zip(headers, links, snippets, markdown_contents)):
@@ -170,37 +173,39 @@ class ProductionRAGModule:
 
                         for chunk_idx, chunk in enumerate(chunks):
                             if len(chunk.strip()) > 50:
-                                try:
-                                    embedding = self.model.encode(chunk, show_progress_bar=False)
-
-                                    point = PointStruct(
-                                        id=str(uuid.uuid4()),
-                                        vector=embedding.tolist(),
-                                        payload={
-                                            "title": header[:200],  # Limit title length
-                                            "link": link,
-                                            "snippet": snippet[:500],  # Limit snippet length
-                                            "content": chunk,
-                                            "chunk_index": chunk_idx,
-                                            "source_index": i,
-                                            "timestamp": int(time.time())
-                                        }
-                                    )
-                                    research_papers.append(point)
-                                    processed_count += 1
-
-                                except Exception as e:
-                                    logger.warning(f"Error processing chunk {chunk_idx} for document {i}: {e}")
-                                    continue
+                                chunk_texts.append(chunk)
+                                chunk_payloads.append({
+                                    "title": header[:200],  # Limit title length
+                                    "link": link,
+                                    "snippet": snippet[:500],  # Limit snippet length
+                                    "content": chunk,
+                                    "chunk_index": chunk_idx,
+                                    "source_index": i,
+                                    "timestamp": int(time.time())
+                                })
 
                 except Exception as e:
                     logger.warning(f"Error processing document {i}: {e}")
                     continue
 
+            research_papers = []
+            if chunk_texts:
+                embeddings = await asyncio.to_thread(
+                    self.model.encode,
+                    chunk_texts,
+                    batch_size=self.embedding_batch_size,
+                    show_progress_bar=False
+                )
+                research_papers = [
+                    PointStruct(id=str(uuid.uuid4()), vector=embedding.tolist(), payload=payload)
+                    for embedding, payload in zip(embeddings, chunk_payloads)
+                ]
+
             if research_papers:
                 # Batch insert with error handling
                 try:
-                    self.qdrant_client.upsert(
+                    await asyncio.to_thread(
+                        self.qdrant_client.upsert,
                         collection_name=self.collection_name,
                         points=research_papers
                     )
@@ -258,9 +263,10 @@ class ProductionRAGModule:
             if top_k is None:
                 top_k = self.rag_top_k
 
-            query_embedding = self.model.encode(query, show_progress_bar=False)
+            query_embedding = await asyncio.to_thread(self.model.encode, query, show_progress_bar=False)
 
-            search_results = self.qdrant_client.search(
+            search_results = await asyncio.to_thread(
+                self.qdrant_client.search,
                 collection_name=self.collection_name,
                 query_vector=query_embedding.tolist(),
                 limit=min(top_k, 50),  # Limit maximum results
@@ -82,7 +82,9 @@ class RAGModule:
         links = search_results['links']
         snippets = search_results['snippets']
 
-        research_papers = []
+        # Collect every chunk first so they can be embedded in a single batched call
+        chunk_texts = []
+        chunk_payloads = []
 
         for i, (header, link, snippet, content) in enumerate(zip(headers, links, snippets, markdown_contents)):
             if self.is_research_paper(header, link, snippet):
@@ -94,21 +96,23 @@ class RAGModule:
 
                 for chunk_idx, chunk in enumerate(chunks):
                     if len(chunk.strip()) > 50:  # Only add substantial chunks
-                        embedding = self.model.encode(chunk)
-
-                        point = PointStruct(
-                            id=str(uuid.uuid4()),
-                            vector=embedding.tolist(),
-                            payload={
-                                "title": header,
-                                "link": link,
-                                "snippet": snippet,
-                                "content": chunk,
-                                "chunk_index": chunk_idx,
-                                "source_index": i
-                            }
-                        )
-                        research_papers.append(point)
+                        chunk_texts.append(chunk)
+                        chunk_payloads.append({
+                            "title": header,
+                            "link": link,
+                            "snippet": snippet,
+                            "content": chunk,
+                            "chunk_index": chunk_idx,
+                            "source_index": i
+                        })
+
+        research_papers = []
+        if chunk_texts:
+            embeddings = self.model.encode(chunk_texts)
+            research_papers = [
+                PointStruct(id=str(uuid.uuid4()), vector=embedding.tolist(), payload=payload)
+                for embedding, payload in zip(embeddings, chunk_payloads)
+            ]
 
         if research_papers:
             self.qdrant_client.upsert(
@@ -138,13 +142,14 @@ class RAGModule:
 
         return chunks
 
-    def search_relevant_papers(self, query: str, top_k: int = None) -> List[Dict[str, Any]]:
-        """Search for relevant research papers"""
+    def search_relevant_papers(self, query: str, top_k: int = None, query_embedding=None) -> List[Dict[str, Any]]:
+        """Search for relevant research papers, reusing query_embedding if it was precomputed"""
         try:
             if top_k is None:
                 top_k = self.rag_top_k
 
-            query_embedding = self.model.encode(query)
+            if query_embedding is None:
+                query_embedding = self.model.encode(query)
 
             search_results = self.qdrant_client.search(
                 collection_name=self.collection_name,
@@ -168,9 +173,9 @@ class RAGModule:
             print(f"Error searching papers: {e}")
             return []
 
-    def get_rag_context(self, query: str, top_k: int = None) -> str:
+    def get_rag_context(self, query: str, top_k: int = None, query_embedding=None) -> str:
         """Get research paper context for RAG"""
-        papers = self.search_relevant_papers(query, top_k)
+        papers = self.search_relevant_papers(query, top_k, query_embedding=query_embedding)
 
         if not papers:
             return ""
@@ -7,8 +7,9 @@ Returns structured JSON for frontend integration
 import os
 import asyncio
 import json
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
@@ -18,7 +19,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Import our search engine
-from serper import process_search_query, SearchResponse, rag, summarize_source, SourceSummary
+from serper import process_search_query, SearchResponse, get_rag, summarize_source, SourceSummary, shutdown
 import logging
 
 # Setup logging
@@ -29,7 +30,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="RAG Search Engine API",
     description="Production search engine with RAG capabilities",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware for frontend
@@ -41,6 +43,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _model_response(model: BaseModel) -> Response:
+    """Serialize a response model in one pass with pydantic-core, skipping jsonable_encoder"""
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
 class SearchRequest(BaseModel):
     query: str
     max_results: Optional[int] = 20
@@ -56,11 +62,24 @@ class HealthResponse(BaseModel):
     message: str
     system_health: dict
 
+@app.on_event("startup")
+async def warm_rag():
+    """Load the embedding model and connect to Qdrant off the event loop before serving requests"""
+    try:
+        await asyncio.to_thread(get_rag)
+    except Exception as e:
+        logger.warning(f"RAG warm-up failed, will retry on first use: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_clients():
+    """Close the shared web crawler and HTTP client when the server stops"""
+    await shutdown()
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
     try:
-        health = rag.health_check()
+        health = await asyncio.to_thread(lambda: get_rag().health_check())
         return HealthResponse(
             status="healthy" if health["status"] == "healthy" else "unhealthy",
             message="System is operational" if health["status"] == "healthy" else "System has issues",
@@ -103,7 +122,7 @@ async def search(request: SearchRequest):
         )
 
         logger.info(f"Successfully processed search query: {request.query} - {result.total_results} results on page {result.current_page}")
-        return result
+        return _model_response(result)
 
     except ValueError as e:
         logger.error(f"Search validation error: {e}")
@@ -148,7 +167,7 @@ async def summarize_source_endpoint(request: SourceSummaryRequest):
         summary = await summarize_source(request.source_url, request.original_query)
 
         logger.info(f"Successfully processed source summary for: {request.source_url}")
-        return summary
+        return _model_response(summary)
 
     except ValueError as e:
         logger.error(f"Source summarization validation error: {e}")
@@ -0,0 +1,55 @@
+"""
+On-disk cache of search responses for the test scripts, so repeat runs skip the search/crawl/LLM pipeline
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import functools
+import contextlib
+from typing import Optional
+from serper import SearchResponse, is_fallback_overview
+
+CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", os.path.join(os.path.dirname(__file__), ".search_cache.sqlite3"))
+CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(24 * 60 * 60)))  # Seconds; 0 disables the cache
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, created REAL, body TEXT)")
+    return conn
+
+def _key(query: str, page: int, per_page: int) -> str:
+    return hashlib.sha256(f"{query}|{page}|{per_page}".encode()).hexdigest()
+
+def lookup(query: str, page: int = 1, per_page: int = 20) -> Optional[SearchResponse]:
+    """Return the cached response for (query, page, per_page) if it is still fresh"""
+    if CACHE_TTL <= 0:
+        return None
+    with contextlib.closing(_connect()) as conn:
+        row = conn.execute("SELECT created, body FROM responses WHERE key = ?", (_key(query, page, per_page),)).fetchone()
+    if row and time.time() - row[0] < CACHE_TTL:
+        return SearchResponse.model_validate_json(row[1])
+    return None
+
+def cached(func):
+    """Wrap process_search_query so results are reused across runs for the same (query, page, per_page)"""
+    @functools.wraps(func)
+    async def wrapper(query: str, page: int = 1, per_page: int = 20, **kwargs) -> SearchResponse:
+        hit = lookup(query, page, per_page)
+        if hit is not None:
+            return hit
+
+        result = await func(query, page=page, per_page=per_page, **kwargs)
+        # A fallback overview means the crawl or LLM failed this time; don't replay it for the whole TTL
+        if CACHE_TTL <= 0 or is_fallback_overview(result.ai_overview):
+            return result
+
+        with contextlib.closing(_connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, created, body) VALUES (?, ?, ?)",
+                (_key(query, page, per_page), time.time(), result.model_dump_json())
+            )
+        return result
+
+    return wrapper
@@ -1,19 +1,29 @@
-import requests
-import json
+import httpx
+import msgspec
 import asyncio
-from crawl4ai import AsyncWebCrawler, BrowserConfig
-from pydantic_ai import Agent, RunContext
-from pydantic_ai.models.openai import OpenAIModel
 from pydantic import BaseModel, Field
 import os
+import sys
+import functools
+import hashlib
+import contextlib
+import threading
+from time import perf_counter
 from dotenv import load_dotenv
-from dataclasses import dataclass
-from typing import List, Optional, Union
-from qdrant_client import QdrantClient
-from production_rag import ProductionRAGModule
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, NamedTuple, Optional, Union
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from cachetools import TTLCache
 import logging
 import os
 
+# Use uvloop for the crawler/Serper event loop when it is available
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 # Set production environment variables
 os.environ['TOKENIZERS_PARALLELISM'] = 'false'
 os.environ['LOGFIRE_IGNORE_NO_CONFIG'] = '1'
@@ -25,15 +35,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize production RAG
-try:
-    rag = ProductionRAGModule()
-    logger.info("Production RAG module initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize RAG module: {e}")
-    raise
+# Shared async HTTP/2 client so Serper requests reuse keep-alive connections without blocking the loop
+SERPER_CLIENT = httpx.AsyncClient(
+    base_url="https://google.serper.dev",
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_keepalive_connections=10)
+)
+
+# Production RAG is initialized on first use so Serper-only paths never load it
+_RAG = None
+# get_rag() is called from worker threads; the lock keeps concurrent first calls from each loading the model
+_RAG_LOCK = threading.Lock()
+
+def get_rag():
+    global _RAG
+    if _RAG is not None:
+        return _RAG
+
+    with _RAG_LOCK:
+        if _RAG is None:
+            from production_rag import ProductionRAGModule
+
+            try:
+                _RAG = ProductionRAGModule()
+                logger.info("Production RAG module initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize RAG module: {e}")
+                raise
+    return _RAG
+
 load_dotenv()
 
+# Serper response schema, decoded straight from the response bytes
+class _SerperOrganic(msgspec.Struct):
+    # Left untyped so a null or non-string field drops that one entry instead of failing the whole decode
+    title: Any = "Unknown Title"
+    link: Any = ""
+    snippet: Any = ""
+
+class _SerperKnowledgeGraph(msgspec.Struct):
+    description: Optional[str] = None
+
+class _SerperResponse(msgspec.Struct):
+    organic: List[_SerperOrganic] = []
+    knowledgeGraph: Optional[_SerperKnowledgeGraph] = None
+
 class SearchResult(BaseModel):
     title: str = Field(description="Title of the search result")
     link: str = Field(description="URL of the search result")
@@ -83,12 +130,19 @@ class SearchResponse(BaseModel):
     total_available: int = Field(default=0, description="Total results available across all pages")
     has_next_page: bool = Field(default=False, description="Whether there are more pages available")
 
-@dataclass
+class _SearchRecord(NamedTuple):
+    """One Serper result and its crawled markdown, kept together instead of in parallel lists"""
+    header: str
+    link: str
+    snippet: str
+    markdown: str = ""
+
+@dataclass(slots=True)
 class SearchContext:
     query: str
     combined_content: str
     rag_context: str = ""
-    sources_list: List[SearchResult] = Field(default_factory=list)
+    sources_list: List[SearchResult] = field(default_factory=list)
 
 api_key = os.getenv("OPENAI_API_KEY")
 if api_key:
@@ -96,13 +150,7 @@ if api_key:
     os.environ["OPENAI_API_KEY"] = api_key
     os.environ["OPENAI_BASE_URL"] = "https://openrouter.ai/api/v1"
 
-model = OpenAIModel('gpt-4o-mini')
-
-final_agent = Agent(
-    model=model,
-    result_type=AIOverview,
-    deps_type=SearchContext,
-    system_prompt="""You are an elite research analyst and academic writer with expertise across all fields of knowledge. Your primary mission is to create extraordinarily comprehensive, detailed, and expert-level AI overviews that rival the depth and quality of professional research reports. You have the analytical capability of a PhD researcher combined with the writing skills of a seasoned academic author.
+FINAL_AGENT_SYSTEM_PROMPT = """You are an elite research analyst and academic writer with expertise across all fields of knowledge. Your primary mission is to create extraordinarily comprehensive, detailed, and expert-level AI overviews that rival the depth and quality of professional research reports. You have the analytical capability of a PhD researcher combined with the writing skills of a seasoned academic author.
 
 CRITICAL TEMPORAL CONTEXT:
 - The current year is 2025 (September 21, 2025 specifically)
@@ -371,27 +419,6 @@ FAILURE CONDITIONS:
 ✗ Claims not supported by sources = FAILED
 ✗ Less than 3 substantial paragraphs = FAILED
 ✗ Missing proper citations = FAILED"""
-) 
-
-@final_agent.system_prompt
-def add_search_context(ctx: RunContext[SearchContext]) -> str:
-    base_prompt = f"User searched for: '{ctx.deps.query}'.\n\n"
-
-    # Add sources list for citation reference
-    if ctx.deps.sources_list:
-        base_prompt += "SOURCES FOR CITATION:\n"
-        for source in ctx.deps.sources_list:
-            base_prompt += f"[{source.source_number}] {source.title} - {source.link}\n"
-        base_prompt += "\n"
-
-    base_prompt += f"CONTENT TO SUMMARIZE:\n{ctx.deps.combined_content}"
-
-    if ctx.deps.rag_context:
-        base_prompt += f"\n\nADDITIONAL RESEARCH CONTEXT:\n{ctx.deps.rag_context}"
-
-    base_prompt += "\n\nRemember to cite sources using [1], [2], etc. format for every factual claim."
-
-    return base_prompt
 
 # Source Summarization Models
 class SourceSummary(BaseModel):
@@ -408,12 +435,8 @@ class SourceContext(BaseModel):
     source_url: str = Field(description="URL of the source")
     original_query: str = Field(description="The original search query for context")
 
-# Source Summarization Agent
-source_agent = Agent(
-    model=model,
-    result_type=SourceSummary,
-    deps_type=SourceContext,
-    system_prompt="""You are an expert content analyst specializing in creating comprehensive, detailed summaries of individual sources. Your task is to thoroughly analyze and summarize a single source document with the same depth and quality as a main AI overview.
+# Source Summarization Agent prompt
+SOURCE_AGENT_SYSTEM_PROMPT = """You are an expert content analyst specializing in creating comprehensive, detailed summaries of individual sources. Your task is to thoroughly analyze and summarize a single source document with the same depth and quality as a main AI overview.
 
 CORE REQUIREMENTS:
 - Create a comprehensive summary that captures all important information from the source
@@ -450,23 +473,87 @@ CONTENT TYPE IDENTIFICATION:
 - Consider this classification when assessing credibility and depth
 
 CRITICAL: Base your analysis ONLY on the provided source content. Do not add external information or make assumptions beyond what's explicitly stated in the source."""
-)
 
-@source_agent.system_prompt
-def add_source_context(ctx: RunContext[SourceContext]) -> str:
-    return f"""
+# Agents are built on first use so importing this module doesn't load pydantic_ai.
+# The static system prompts are sent first and never interpolated, so every request starts with
+# the same bytes and the provider's automatic prompt caching can reuse the prefix.
+@functools.cache
+def _get_model():
+    from pydantic_ai.models.openai import OpenAIModel
+    return OpenAIModel('gpt-4o-mini')
+
+@functools.cache
+def _get_final_agent():
+    from pydantic_ai import Agent, RunContext
+
+    agent = Agent(
+        model=_get_model(),
+        result_type=AIOverview,
+        deps_type=SearchContext,
+        system_prompt=FINAL_AGENT_SYSTEM_PROMPT
+    )
+
+    @agent.system_prompt
+    def add_search_context(ctx: RunContext[SearchContext]) -> str:
+        base_prompt = f"User searched for: '{ctx.deps.query}'.\n\n"
+
+        # Add sources list for citation reference
+        if ctx.deps.sources_list:
+            base_prompt += "SOURCES FOR CITATION:\n"
+            for source in ctx.deps.sources_list:
+                base_prompt += f"[{source.source_number}] {source.title} - {source.link}\n"
+            base_prompt += "\n"
+
+        base_prompt += f"CONTENT TO SUMMARIZE:\n{ctx.deps.combined_content}"
+
+        if ctx.deps.rag_context:
+            base_prompt += f"\n\nADDITIONAL RESEARCH CONTEXT:\n{ctx.deps.rag_context}"
+
+        base_prompt += "\n\nRemember to cite sources using [1], [2], etc. format for every factual claim."
+
+        return base_prompt
+
+    return agent
+
+@functools.cache
+def _get_source_agent():
+    from pydantic_ai import Agent, RunContext
+
+    agent = Agent(
+        model=_get_model(),
+        result_type=SourceSummary,
+        deps_type=SourceContext,
+        system_prompt=SOURCE_AGENT_SYSTEM_PROMPT
+    )
+
+    @agent.system_prompt
+    def add_source_context(ctx: RunContext[SourceContext]) -> str:
+        # Per-source content comes before the query so repeat summaries of one URL share a cached prefix
+        return f"""
 SOURCE TO ANALYZE:
 Title: {ctx.deps.source_title}
 URL: {ctx.deps.source_url}
-Original Query: "{ctx.deps.original_query}"
 
 CONTENT:
 {ctx.deps.source_content}
 
+Original Query: "{ctx.deps.original_query}"
+
 Provide a comprehensive analysis and summary of this source with the same depth and quality as a main AI overview.
 """
- 
-def get_header_link_snippet_from_user_query(query: str):
+
+    return agent
+
+def __getattr__(name: str):
+    """Keep `from serper import final_agent, source_agent` working for the test scripts"""
+    if name == "final_agent":
+        return _get_final_agent()
+    if name == "source_agent":
+        return _get_source_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def get_header_link_snippet_from_user_query(query: str):
     """Get the header, link, and snippet from a user query using Serper API with enhanced error handling"""
     header = []
     link = []
@@ -483,22 +570,20 @@ def get_header_link_snippet_from_user_query(query: str):
             logger.error("SERPER_API_KEY not found in environment variables")
             return {"headers": header, "links": link, "snippets": snippet}
 
-        queries = query.split()
-        total_query = "+".join(queries)
-        url = f"https://google.serper.dev/search?q={total_query}&num=20&apiKey={serper_api_key}"
-
-        # Add timeout and retry logic
-        response = requests.get(url, timeout=30)
+        response = await SERPER_CLIENT.get(
+            "/search",
+            params={"q": " ".join(query.split()), "num": 20},
+            headers={"X-API-KEY": serper_api_key}  # A header, since httpx logs request URLs at INFO
+        )
         response.raise_for_status()
 
-        data = response.json()
+        data = msgspec.json.decode(response.content, type=_SerperResponse)
 
-        if 'knowledgeGraph' in data and 'description' in data['knowledgeGraph']:
-            description = data['knowledgeGraph']['description']
-            logger.info(f"Knowledge Graph Description: {description}")
+        if data.knowledgeGraph and data.knowledgeGraph.description:
+            logger.info(f"Knowledge Graph Description: {data.knowledgeGraph.description}")
 
         logger.info("\nProcessing organic search results...")
-        organic_results = data.get('organic', [])
+        organic_results = data.organic
 
         if not organic_results:
             logger.warning("No organic results found in search response")
@@ -507,309 +592,567 @@ def get_header_link_snippet_from_user_query(query: str):
         # Limit results to prevent overload
         max_results = int(os.getenv("MAX_SEARCH_RESULTS", "10"))
         for result in organic_results[:max_results]:
-            try:
-                title = result.get('title', 'Unknown Title')
-                result_link = result.get('link', '')
-                result_snippet = result.get('snippet', '')
-
-                if title and result_link:  # Only add if we have essential data
-                    header.append(title)
-                    link.append(result_link)
-                    snippet.append(result_snippet)
-                    logger.debug(f"Added result: {title[:50]}...")
-
-            except Exception as e:
-                logger.warning(f"Error processing search result: {e}")
+            if not (isinstance(result.title, str) and isinstance(result.link, str)):
+                logger.warning(f"Skipping malformed search result: {result}")
                 continue
+            if result.title and result.link:  # Only add if we have essential data
+                header.append(result.title)
+                link.append(result.link)
+                snippet.append(result.snippet if isinstance(result.snippet, str) else "")
+                logger.debug(f"Added result: {result.title[:50]}...")
 
         logger.info(f"Successfully processed {len(header)} search results")
 
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         logger.error("Serper API request timed out")
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Serper API request error: {e}")
-    except json.JSONDecodeError as e:
+    except msgspec.DecodeError as e:
         logger.error(f"Failed to parse Serper API response: {e}")
     except Exception as e:
         logger.error(f"Unexpected error in search: {e}")
 
     return {"headers": header, "links": link, "snippets": snippet}
 
-async def get_markdown_from_urls(urls: List[str]) -> List[str]:
-    """Fetch markdown content from multiple URLs with enhanced error handling and rate limiting"""
+# Anti-bot detection headers and stealth mode flags for the crawler browser
+_CHROME_FLAGS: tuple[str, ...] = (
+    "--disable-blink-features=AutomationControlled",
+    "--disable-features=VizDisplayCompositor",
+    "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "--accept-language=en-US,en;q=0.9",
+    "--accept-encoding=gzip, deflate, br",
+    "--accept=text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
+    "--disable-web-security",
+    "--disable-features=TranslateUI",
+    "--disable-ipc-flooding-protection",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-client-side-phishing-detection",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--hide-scrollbars",
+    "--mute-audio",
+    "--no-first-run",
+    "--disable-extensions",
+    "--disable-plugins",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-gpu",
+)
+
+# Long-lived crawler shared across queries so the browser and its connections stay warm
+_CRAWLER = None
+_CRAWLER_LOCK = asyncio.Lock()
+# Consecutive arun() exceptions after which the shared browser is presumed dead and replaced
+_CRAWLER_MAX_FAILURES = int(os.getenv("CRAWLER_MAX_FAILURES", "5"))
+_crawler_failures = 0
+
+async def get_crawler():
+    """Return the shared AsyncWebCrawler, starting it on first use"""
+    global _CRAWLER
+    if _CRAWLER is not None:
+        return _CRAWLER
+
+    async with _CRAWLER_LOCK:
+        if _CRAWLER is None:
+            from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+            browser_config = BrowserConfig(
+                browser_mode="builtin",
+                headless=True,
+                # Anti-bot detection headers and stealth mode
+                extra_args=list(_CHROME_FLAGS)
+            )
+            crawler = AsyncWebCrawler(config=browser_config)
+            await crawler.start()
+            _CRAWLER = crawler
+            logger.info("Started shared web crawler")
+    return _CRAWLER
+
+@functools.cache
+def _crawl_run_config():
+    """Per-page crawl settings, built once; arun() ignores these as loose kwargs when no config is passed"""
+    from crawl4ai import CacheMode, CrawlerRunConfig
+
+    return CrawlerRunConfig(
+        cache_mode=CacheMode.ENABLED,  # Serve repeat URLs from crawl4ai's local cache
+        wait_until="domcontentloaded",  # Don't wait for full load
+        delay_before_return_html=0.2,  # Seconds; domcontentloaded has already fired
+        simulate_user=True,  # Simulate human-like behavior
+        override_navigator=True  # Override navigator properties for stealth
+    )
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limiter: +1 slot per window of successes, multiplicative backoff on overload"""
+
+    def __init__(self, min_concurrency: int = 2, max_concurrency: int = 32,
+                 initial_concurrency: int = 5, backoff_factor: float = 0.5):
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff_factor = backoff_factor
+        self.limit = initial_concurrency
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def record_success(self):
+        self._successes += 1
+        if self._successes >= self.limit:
+            self._successes = 0
+            if self.limit < self.max_concurrency:
+                self.limit += 1
+                logger.debug(f"Crawl concurrency raised to {self.limit}")
+
+    def record_overload(self):
+        self._successes = 0
+        new_limit = max(self.min_concurrency, int(self.limit * self.backoff_factor))
+        if new_limit != self.limit:
+            self.limit = new_limit
+            logger.debug(f"Crawl concurrency lowered to {self.limit}")
+
+# Shared across queries so the learned concurrency carries over between searches
+_CRAWL_LIMITER = AdaptiveConcurrencyLimiter(min_concurrency=2, max_concurrency=32, initial_concurrency=5)
+_PER_HOST_CONCURRENCY = 3
+# Seconds to keep waiting for stragglers once half of a batch has finished crawling
+_CRAWL_TAIL_BUDGET = float(os.getenv("CRAWL_TAIL_BUDGET", "8"))
+
+# Limit content size per page to prevent memory issues
+_MAX_CONTENT_SIZE = 50_000
+# Below this many crawled characters per query there is nothing worth sending to the LLM
+_MIN_OVERVIEW_CONTENT = int(os.getenv("MIN_OVERVIEW_CONTENT", "500"))
+
+# Crawled (already truncated) markdown keyed by normalized URL
+_URL_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+
+# Generated source summaries keyed by (normalized URL, query hash)
+_SOURCE_SUMMARY_CACHE: TTLCache = TTLCache(maxsize=2000, ttl=1800)
+
+def _normalize_url(url: str) -> str:
+    """Cache/dedup key for a URL: lowercase scheme and host, no utm_* params, no fragment"""
+    parts = urlsplit(url)
+    query = parts.query
+    if "utm_" in query:
+        query = urlencode([(k, v) for k, v in parse_qsl(query, keep_blank_values=True) if not k.startswith("utm_")])
+    return parts._replace(scheme=parts.scheme.lower(), netloc=parts.netloc.lower(), query=query, fragment="").geturl()
+
+async def close_crawler(crawler=None):
+    """Shut down the shared crawler, if one was started (and, when given, is still this crawler)"""
+    global _CRAWLER
+    async with _CRAWLER_LOCK:
+        if _CRAWLER is not None and (crawler is None or crawler is _CRAWLER):
+            try:
+                await _CRAWLER.close()
+                logger.info("Closed shared web crawler")
+            except Exception as e:
+                logger.warning(f"Error closing web crawler: {e}")
+            finally:
+                _CRAWLER = None
+
+def _record_crawler_success() -> None:
+    """Any completed arun() means the browser is still alive"""
+    global _crawler_failures
+    _crawler_failures = 0
+
+async def _record_crawler_failure(crawler, error: Exception) -> None:
+    """Drop the shared crawler once its browser looks dead, so the next get_crawler() starts a fresh one"""
+    global _crawler_failures
+    _crawler_failures += 1
+    if _crawler_failures >= _CRAWLER_MAX_FAILURES or "has been closed" in str(error):
+        logger.warning(f"Restarting web crawler after {_crawler_failures} consecutive failures: {error}")
+        _crawler_failures = 0
+        await close_crawler(crawler)
+
+async def shutdown():
+    """Release the shared crawler and HTTP client"""
+    await close_crawler()
+    await SERPER_CLIENT.aclose()
+
+def _max_crawl_urls() -> int:
+    """Upper bound on URLs crawled per batch"""
+    return int(os.getenv("MAX_SEARCH_RESULTS", "10"))
+
+async def iter_markdown_from_urls(urls: List[str]) -> AsyncIterator[tuple[int, str]]:
+    """Yield (index, markdown) per URL as each crawl finishes; stragglers past the tail budget are dropped"""
     if not urls:
         logger.warning("No URLs provided for crawling")
-        return []
+        return
 
     # Limit number of URLs to prevent overload
-    max_urls = int(os.getenv("MAX_SEARCH_RESULTS", "10"))
-    urls = urls[:max_urls]
+    urls = urls[:_max_crawl_urls()]
 
     logger.info(f"Starting to crawl {len(urls)} URLs...")
 
-    try:
-        browser_config = BrowserConfig(
-            browser_mode="builtin",
-            headless=True,
-            # Anti-bot detection headers and stealth mode
-            extra_args=[
-                "--disable-blink-features=AutomationControlled",
-                "--disable-features=VizDisplayCompositor",
-                "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "--accept-language=en-US,en;q=0.9",
-                "--accept-encoding=gzip, deflate, br",
-                "--accept=text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
-                "--disable-web-security",
-                "--disable-features=TranslateUI",
-                "--disable-ipc-flooding-protection",
-                "--disable-renderer-backgrounding",
-                "--disable-backgrounding-occluded-windows",
-                "--disable-client-side-phishing-detection",
-                "--disable-sync",
-                "--disable-default-apps",
-                "--hide-scrollbars",
-                "--mute-audio",
-                "--no-first-run",
-                "--disable-extensions",
-                "--disable-plugins",
-                "--disable-dev-shm-usage",
-                "--no-sandbox",
-                "--disable-setuid-sandbox",
-                "--disable-gpu"
-            ]
-        )
-
-        async def fetch_single_url(crawler, url: str, index: int) -> str:
-            try:
-                if not url or not url.startswith(('http://', 'https://')):
-                    logger.warning(f"Invalid URL {index}: {url}")
-                    return ""
-
-                logger.debug(f"Crawling URL {index + 1}/{len(urls)}: {url[:50]}...")
-
-                # Enhanced crawling with retry logic and stealth settings
-                max_retries = 1  # Reduced from 2 to 1 for faster performance
-                for attempt in range(max_retries + 1):
-                    try:
-                        # Add delay between attempts to avoid rate limiting
-                        if attempt > 0:
-                            await asyncio.sleep(1 * attempt)
-                            logger.debug(f"Retry attempt {attempt} for URL {index + 1}: {url[:50]}...")
-
-                        # Use more conservative crawling settings for better success rate
-                        result = await asyncio.wait_for(
-                            crawler.arun(
-                                url=url,
-                                wait_for="domcontentloaded",  # Don't wait for full load
-                                delay_before_return_html=1000,  # Reduced from 2s to 1s for faster performance
-                                bypass_cache=True,
-                                simulate_user=True,  # Simulate human-like behavior
-                                override_navigator=True  # Override navigator properties for stealth
-                            ),
-                            timeout=15.0  # Reduced from 30s to 15s for faster performance
-                        )
-
-                        # If successful, break out of retry loop
-                        if result.success:
-                            break
-                        elif attempt < max_retries:
-                            logger.warning(f"Attempt {attempt + 1} failed for URL {index + 1}: {url[:50]}... - Retrying")
-                            continue
-                        else:
-                            logger.warning(f"All {max_retries + 1} attempts failed for URL {index + 1}: {url[:50]}...")
-                            return ""
-
-                    except asyncio.TimeoutError:
-                        if attempt < max_retries:
-                            logger.warning(f"Timeout on attempt {attempt + 1} for URL {index + 1}: {url[:50]}... - Retrying")
-                            continue
-                        else:
-                            logger.error(f"Final timeout for URL {index + 1}: {url[:50]}...")
-                            return ""
-
-                    except Exception as e:
-                        if attempt < max_retries:
-                            logger.debug(f"Error on attempt {attempt + 1} for URL {index + 1}: {e} - Retrying")
-                            continue
-                        else:
-                            logger.debug(f"Final error for URL {index + 1}: {e}")
-                            return ""
-
-                content = result.markdown if result.markdown else ""
-
-                # Limit content size to prevent memory issues
-                max_content_size = 50000  # 50KB limit
-                if len(content) > max_content_size:
-                    content = content[:max_content_size] + "..."
-                    logger.warning(f"Content truncated for URL {index}: {url[:50]}...")
-
-                logger.debug(f"Successfully crawled URL {index + 1}: {len(content)} characters")
-                return content
-
-            except asyncio.TimeoutError:
-                logger.debug(f"Timeout crawling URL {index}: {url}")
-                return ""
-            except Exception as e:
-                logger.debug(f"Error crawling URL {index} ({url}): {e}")
+    async def fetch_single_url(crawler, url: str, index: int) -> str:
+        try:
+            if not url or not url.startswith(('http://', 'https://')):
+                logger.warning(f"Invalid URL {index}: {url}")
                 return ""
 
-        try:
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                # Process URLs with controlled concurrency - increased for better performance
-                semaphore = asyncio.Semaphore(5)  # Increased from 2 to 5 concurrent requests for faster crawling
-
-                async def limited_fetch(url: str, index: int) -> str:
-                    async with semaphore:
-                        return await fetch_single_url(crawler, url, index)
-
-                tasks = [limited_fetch(url, i) for i, url in enumerate(urls)]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                # Process results and handle exceptions
-                markdown_contents = []
-                for i, result in enumerate(results):
-                    if isinstance(result, Exception):
-                        logger.debug(f"Exception for URL {i}: {result}")
-                        markdown_contents.append("")
+            cache_key = _normalize_url(url)
+            cached = _URL_CACHE.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Cache hit for URL {index + 1}: {url[:50]}...")
+                return cached
+
+            logger.debug(f"Crawling URL {index + 1}/{len(urls)}: {url[:50]}...")
+
+            # Enhanced crawling with retry logic and stealth settings
+            max_retries = 1  # Reduced from 2 to 1 for faster performance
+            for attempt in range(max_retries + 1):
+                try:
+                    # Add delay between attempts to avoid rate limiting
+                    if attempt > 0:
+                        await asyncio.sleep(1 * attempt)
+                        logger.debug(f"Retry attempt {attempt} for URL {index + 1}: {url[:50]}...")
+
+                    # Use more conservative crawling settings for better success rate
+                    result = await asyncio.wait_for(
+                        crawler.arun(url=url, config=_crawl_run_config()),
+                        timeout=15.0  # Reduced from 30s to 15s for faster performance
+                    )
+                    _record_crawler_success()
+
+                    # If successful, break out of retry loop
+                    if result.success:
+                        _CRAWL_LIMITER.record_success()
+                        break
+
+                    _CRAWL_LIMITER.record_overload()
+                    if attempt < max_retries:
+                        logger.warning(f"Attempt {attempt + 1} failed for URL {index + 1}: {url[:50]}... - Retrying")
+                        continue
                     else:
-                        markdown_contents.append(result)
-
-                success_count = sum(1 for content in markdown_contents if content)
-                logger.info(f"Successfully crawled {success_count}/{len(urls)} URLs")
-
-                return markdown_contents
-
+                        logger.warning(f"All {max_retries + 1} attempts failed for URL {index + 1}: {url[:50]}...")
+                        return ""
+
+                except asyncio.TimeoutError:
+                    _CRAWL_LIMITER.record_overload()
+                    if attempt < max_retries:
+                        logger.warning(f"Timeout on attempt {attempt + 1} for URL {index + 1}: {url[:50]}... - Retrying")
+                        continue
+                    else:
+                        logger.error(f"Final timeout for URL {index + 1}: {url[:50]}...")
+                        return ""
+
+                except Exception as e:
+                    await _record_crawler_failure(crawler, e)
+                    if attempt < max_retries:
+                        logger.debug(f"Error on attempt {attempt + 1} for URL {index + 1}: {e} - Retrying")
+                        continue
+                    else:
+                        logger.debug(f"Final error for URL {index + 1}: {e}")
+                        return ""
+
+            # Slice in one step: this caps the size and also yields a plain str, so the cache
+            # doesn't keep crawl4ai's markdown result (raw/fit/cited variants) alive
+            markdown = result.markdown or ""
+            content = markdown[:_MAX_CONTENT_SIZE]
+            if len(markdown) > _MAX_CONTENT_SIZE:
+                content += "..."
+                logger.warning(f"Content truncated for URL {index}: {url[:50]}...")
+
+            if content:
+                _URL_CACHE[cache_key] = content
+
+            logger.debug(f"Successfully crawled URL {index + 1}: {len(content)} characters")
+            return content
+
+        except asyncio.TimeoutError:
+            logger.debug(f"Timeout crawling URL {index}: {url}")
+            return ""
         except Exception as e:
-            logger.error(f"Error initializing crawler: {e}")
-            return [""] * len(urls)
+            logger.debug(f"Error crawling URL {index} ({url}): {e}")
+            return ""
 
+    try:
+        crawler = await get_crawler()
     except Exception as e:
-        logger.error(f"Unexpected error in URL crawling: {e}")
-        return [""] * len(urls)
-async def process_search_query(query: str, page: int = 1, per_page: int = 20) -> SearchResponse:
-    """Process a search query and return structured results"""
-    import time
-    start_time = time.time()
+        logger.error(f"Error initializing crawler: {e}")
+        return
 
-    logger.info(f"Processing query: {query}")
+    # Adaptive overall concurrency, plus a small per-host cap so no single origin is hammered
+    host_semaphores = {}
+
+    async def limited_fetch(url: str, index: int) -> tuple[int, str]:
+        host = urlsplit(url).netloc.lower()
+        host_semaphore = host_semaphores.setdefault(host, asyncio.Semaphore(_PER_HOST_CONCURRENCY))
+        async with host_semaphore:
+            async with _CRAWL_LIMITER.acquire():
+                return index, await fetch_single_url(crawler, url, index)
+
+    # Crawl each distinct URL once; duplicates are yielded alongside the first occurrence
+    keys = [_normalize_url(url) for url in urls]
+    indices_by_key = {}
+    for i, key in enumerate(keys):
+        indices_by_key.setdefault(key, []).append(i)
+    if len(indices_by_key) < len(urls):
+        logger.info(f"Skipping {len(urls) - len(indices_by_key)} duplicate URLs")
+
+    # Schedule URLs grouped by host so each host's fetches queue back-to-back on its warm connections
+    order = sorted((indices[0] for indices in indices_by_key.values()), key=lambda i: urlsplit(urls[i]).netloc.lower())
+    pending = {asyncio.create_task(limited_fetch(urls[i], i)) for i in order}
+
+    # Yield results as they complete; once half are in, give the tail a fixed budget
+    loop = asyncio.get_running_loop()
+    completed = 0
+    success_count = 0
+    deadline = None
+    try:
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
 
-    # Step 1: Get search results
-    search_results = get_header_link_snippet_from_user_query(query)
-    headers = search_results['headers']
-    links = search_results['links']
-    snippets = search_results['snippets']
+            for task in done:
+                completed += 1
+                try:
+                    index, content = task.result()
+                except Exception as e:
+                    logger.debug(f"Exception while crawling: {e}")
+                    continue
+
+                duplicates = indices_by_key[keys[index]]
+                if content:
+                    success_count += len(duplicates)
+                for i in duplicates:
+                    yield i, content
+
+            if deadline is None and completed * 2 >= len(order):
+                deadline = loop.time() + _CRAWL_TAIL_BUDGET
+
+        if pending:
+            logger.info(f"Cancelling {len(pending)} slow URL fetches after {_CRAWL_TAIL_BUDGET:g}s tail budget")
+    finally:
+        # Also reached when the consumer stops iterating early
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    logger.info(f"Successfully crawled {success_count}/{len(urls)} URLs")
 
-    if not headers:
-        raise ValueError("No search results found")
+async def get_markdown_from_urls(urls: List[str]) -> List[str]:
+    """Fetch markdown content from multiple URLs with enhanced error handling and rate limiting"""
+    urls = urls[:_max_crawl_urls()]
+    markdown_contents = [""] * len(urls)
 
-    logger.info(f"Found {len(headers)} search results")
+    try:
+        async for index, content in iter_markdown_from_urls(urls):
+            markdown_contents[index] = content
+    except Exception as e:
+        logger.error(f"Unexpected error in URL crawling: {e}")
 
-    # Step 2: Create structured search results
-    structured_results = []
-    sources_list = []
+    return markdown_contents
 
-    for i, (header, link, snippet) in enumerate(zip(headers, links, snippets), 1):
-        search_result = SearchResult(
-            title=header,
-            link=link,
-            snippet=snippet,
-            source_number=i
-        )
-        structured_results.append(search_result)
-        sources_list.append(search_result)
+async def fetch_one(url: str) -> str:
+    """Fetch markdown for a single URL, answering from the URL cache without touching the crawler"""
+    cached = _URL_CACHE.get(_normalize_url(url))
+    if cached is not None:
+        return cached
 
-    # Step 3: Crawl content
-    try:
-        markdown_contents = await get_markdown_from_urls(links)
-        successful_crawls = sum(1 for content in markdown_contents if content)
-        logger.info(f"Successfully crawled {successful_crawls}/{len(links)} URLs")
-    except Exception as e:
-        logger.error(f"Error in crawling: {e}")
-        markdown_contents = [""] * len(links)
+    contents = await get_markdown_from_urls([url])
+    return contents[0] if contents else ""
 
-    # Step 4: Add to RAG
+async def _ingest_documents(records: List[_SearchRecord]) -> None:
+    """Add crawled documents to RAG, logging instead of raising on failure"""
+    if not records:
+        return
     try:
+        headers, links, snippets, markdown_contents = (list(column) for column in zip(*records))
+        search_results = {"headers": headers, "links": links, "snippets": snippets}
+        rag = await asyncio.to_thread(get_rag)  # First call loads the embedding model; keep it off the loop
         await rag.add_documents(search_results, markdown_contents)
         logger.info("Successfully processed documents for RAG")
     except Exception as e:
         logger.error(f"Error adding documents to RAG: {e}")
 
-    # Step 5: Get RAG context
+async def _fetch_rag_context(query: str) -> str:
+    """Get RAG context for a query, falling back to an empty context on failure"""
     try:
+        rag = await asyncio.to_thread(get_rag)
         rag_context = await rag.get_rag_context(query)
         if rag_context:
             logger.info("Retrieved relevant research paper context")
         else:
             logger.info("No relevant research papers found")
+        return rag_context
     except Exception as e:
         logger.error(f"Error getting RAG context: {e}")
-        rag_context = ""
+        return ""
+
+_FALLBACK_NOTES_NO_CONTENT = "Analysis unavailable because too little source content could be retrieved"
+_FALLBACK_NOTES_ERROR = "Analysis limited due to processing error"
+
+# Repeat failures for the same query (users retry these most) share one instance; nothing mutates it
+@functools.lru_cache(maxsize=256)
+def _fallback_overview(query: str, methodology_notes: str) -> AIOverview:
+    """Low-confidence overview used when no AI analysis could be produced"""
+    # Every field is built here, so skip validation
+    return AIOverview.model_construct(
+        summary=f"Search results for '{query}' show various perspectives on this topic. Due to processing limitations, detailed analysis is not available.",
+        key_points=[f"Multiple sources found for '{query}'", "Detailed analysis temporarily unavailable"],
+        statistics=[],
+        key_findings=[],
+        research_quality=ResearchQuality.model_construct(
+            source_types=["web search results"],
+            academic_paper_count=0,
+            publication_years=[],
+            study_methodologies=[],
+            sample_sizes=[]
+        ),
+        confidence_score=0.3,
+        methodology_notes=methodology_notes,
+        future_research_directions=None
+    )
 
-    # Step 6: Combine content with source references
-    combined_content = ""
-    for i, (header, link, snippet, markdown_content) in enumerate(zip(headers, links, snippets, markdown_contents), 1):
-        combined_content += f"[{i}] {header}\nLink: {link}\nSnippet: {snippet}\nContent: {markdown_content}\n\n"
+def is_fallback_overview(overview: AIOverview) -> bool:
+    """Whether an overview is the low-confidence placeholder rather than a real analysis"""
+    return overview.methodology_notes in (_FALLBACK_NOTES_NO_CONTENT, _FALLBACK_NOTES_ERROR)
 
-    # Step 7: Create search context
-    search_context = SearchContext(
-        query=query,
-        combined_content=combined_content,
-        rag_context=rag_context,
-        sources_list=sources_list
-    )
+async def _search_records(query: str) -> List[_SearchRecord]:
+    """Run the Serper lookup and return its results as records, raising if there are none"""
+    search_results = await get_header_link_snippet_from_user_query(query)
+    records = [
+        _SearchRecord(header, link, snippet)
+        for header, link, snippet in zip(search_results['headers'], search_results['links'], search_results['snippets'])
+    ]
 
-    # Step 8: Generate AI overview
-    try:
-        logger.info("Generating AI overview...")
-        response = await final_agent.run("", deps=search_context)
-        ai_overview = response.data
-        logger.info("Successfully generated AI overview")
-    except Exception as e:
-        logger.error(f"Error generating AI overview: {e}")
-        # Fallback AI overview
-        ai_overview = AIOverview(
-            summary=f"Search results for '{query}' show various perspectives on this topic. Due to processing limitations, detailed analysis is not available.",
-            key_points=[f"Multiple sources found for '{query}'", "Detailed analysis temporarily unavailable"],
-            statistics=[],
-            key_findings=[],
-            research_quality=ResearchQuality(
-                source_types=["web search results"],
-                academic_paper_count=0,
-                publication_years=[],
-                study_methodologies=[],
-                sample_sizes=[]
-            ),
-            confidence_score=0.3,
-            methodology_notes="Analysis limited due to processing error",
-            future_research_directions=None
-        )
+    if not records:
+        raise ValueError("No search results found")
 
-    # Step 9: Calculate processing time
-    processing_time = time.time() - start_time
+    logger.info(f"Found {len(records)} search results")
+    return records
 
-    # Step 10: Apply pagination to results
-    total_available = len(structured_results)
+async def astream_search_query(query: str, page: int = 1, per_page: int = 20,
+                              records: Optional[List[_SearchRecord]] = None) -> AsyncIterator[SearchResult]:
+    """Yield a page's search results as soon as each one's content is crawled, warming the URL cache"""
+    if records is None:
+        records = await _search_records(query)
     start_index = (page - 1) * per_page
-    end_index = start_index + per_page
+    page_records = records[start_index:start_index + per_page]
 
-    # Paginate search results and sources
-    if start_index < total_available:
-        paginated_results = structured_results[start_index:end_index]
-        paginated_sources = sources_list[start_index:end_index]
+    def to_result(index: int) -> SearchResult:
+        record = page_records[index]
+        return SearchResult(title=record.header, link=record.link, snippet=record.snippet, source_number=start_index + index + 1)
+
+    remaining = set(range(len(page_records)))
+    async for index, content in iter_markdown_from_urls([record.link for record in page_records]):
+        # Store the content in the caller's records so process_search_query(crawled=True) reuses this crawl
+        records[start_index + index] = page_records[index]._replace(markdown=content)
+        remaining.discard(index)
+        yield to_result(index)
+
+    # Results past the crawl limit or dropped by the tail budget still belong to the page
+    for index in sorted(remaining):
+        yield to_result(index)
+
+async def process_search_query(query: str, page: int = 1, per_page: int = 20,
+                               records: Optional[List[_SearchRecord]] = None, crawled: bool = False) -> SearchResponse:
+    """Process a search query and return structured results, reusing records from _search_records if given"""
+    start_time = perf_counter()
+
+    logger.info(f"Processing query: {query}")
+
+    # Step 1: Get search results as one list of records
+    if records is None:
+        records = await _search_records(query)
+
+    # Step 2: Work out the requested page up front so only its results are crawled and summarized
+    total_available = len(records)
+    start_index = (page - 1) * per_page
+    end_index = start_index + per_page
+    page_records = records[start_index:end_index]
+
+    # Create structured search results for the page (the sources list is the same list)
+    structured_results = [
+        SearchResult(title=record.header, link=record.link, snippet=record.snippet, source_number=i)
+        for i, record in enumerate(page_records, start_index + 1)
+    ]
+    sources_list = structured_results
+
+    # Step 3: Crawl the page's content, retrieving RAG context for the query in parallel
+    page_links = [record.link for record in page_records]
+    rag_context_task = asyncio.create_task(_fetch_rag_context(query))
+    if crawled:
+        # astream_search_query already crawled the page into records; failed URLs aren't in the URL
+        # cache, so crawling again would retry every one of them
+        markdown_contents = [record.markdown for record in page_records]
     else:
-        paginated_results = []
-        paginated_sources = []
+        try:
+            markdown_contents = await get_markdown_from_urls(page_links)
+        except Exception as e:
+            logger.error(f"Error in crawling: {e}")
+            markdown_contents = [""] * len(page_links)
+
+    page_records = [record._replace(markdown=markdown) for record, markdown in zip(page_records, markdown_contents)]
+
+    # Too little crawled text to ground an overview: skip RAG and the LLM call entirely
+    total_content = sum(len(content) for content in markdown_contents)
+    if total_content < _MIN_OVERVIEW_CONTENT:
+        logger.info(f"Skipping AI overview and RAG: only {total_content} characters crawled from {len(page_links)} URLs")
+        rag_context_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await rag_context_task
+        ai_overview = _fallback_overview(query, _FALLBACK_NOTES_NO_CONTENT)
+    else:
+        # Step 4: Add to RAG in the background while the AI overview is generated
+        ingest_task = asyncio.create_task(_ingest_documents(page_records))
+
+        # Step 5: Get RAG context
+        rag_context = await rag_context_task
+
+        # Step 6: Combine content with source references
+        parts = []
+        for i, record in enumerate(page_records, start_index + 1):
+            parts.append(f"[{i}] {record.header}\nLink: {record.link}\nSnippet: {record.snippet}\nContent: {record.markdown}\n\n")
+        combined_content = "".join(parts)
+
+        # Step 7: Create search context
+        search_context = SearchContext(
+            query=query,
+            combined_content=combined_content,
+            rag_context=rag_context,
+            sources_list=sources_list
+        )
+
+        # Step 8: Generate AI overview
+        try:
+            logger.info("Generating AI overview...")
+            response = await _get_final_agent().run("", deps=search_context)
+            ai_overview = response.data
+            logger.info("Successfully generated AI overview")
+        except Exception as e:
+            logger.error(f"Error generating AI overview: {e}")
+            ai_overview = _fallback_overview(query, _FALLBACK_NOTES_ERROR)
+
+        await ingest_task
 
-    # Calculate pagination metadata
-    has_next_page = (page * per_page) < total_available
+    # Step 9: Calculate processing time
+    processing_time = perf_counter() - start_time
+
+    # Step 10: Calculate pagination metadata
+    has_next_page = end_index < total_available
 
     # Step 11: Create final response with pagination
     search_response = SearchResponse(
         query=query,
-        search_results=paginated_results,
+        search_results=structured_results,
         ai_overview=ai_overview,
-        sources=paginated_sources,
-        total_results=len(paginated_results),
+        sources=sources_list,
+        total_results=len(structured_results),
         processing_time=processing_time,
         current_page=page,
         per_page=per_page,
@@ -823,16 +1166,21 @@ async def summarize_source(source_url: str, original_query: str) -> SourceSummar
     """Generate a comprehensive summary of a specific source"""
     logger.info(f"Generating source summary for: {source_url}")
 
+    cache_key = (_normalize_url(source_url), hashlib.blake2b(original_query.encode(), digest_size=8).hexdigest())
+    cached = _SOURCE_SUMMARY_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info("Returning cached source summary")
+        return cached
+
     try:
         # First, get the content for this specific URL
-        content = await get_markdown_from_urls([source_url])
-        if not content or not content[0]:
+        source_content = await fetch_one(source_url)
+        if not source_content:
             raise ValueError(f"Could not retrieve content from URL: {source_url}")
 
-        source_content = content[0]
-
-        # Extract title from URL or use a default
-        source_title = source_url.split("/")[-1] if "/" in source_url else source_url
+        # Use the last path segment as the title, falling back to the host or the raw URL
+        parts = urlsplit(source_url)
+        source_title = parts.path.rsplit("/", 1)[-1] or parts.netloc or source_url
 
         # Create source context
         source_context = SourceContext(
@@ -844,9 +1192,10 @@ async def summarize_source(source_url: str, original_query: str) -> SourceSummar
 
         # Generate summary using the source agent
         logger.info("Generating source summary...")
-        response = await source_agent.run("", deps=source_context)
+        response = await _get_source_agent().run("", deps=source_context)
         source_summary = response.data
         logger.info("Successfully generated source summary")
+        _SOURCE_SUMMARY_CACHE[cache_key] = source_summary
 
         return source_summary
 
@@ -862,134 +1211,200 @@ async def summarize_source(source_url: str, original_query: str) -> SourceSummar
             content_type="Unknown"
         )
 
+def _print_results(result: SearchResponse) -> None:
+    """Render a search response to the terminal in Google-style format"""
+    print(f"\n{'='*80}")
+    print(f"SEARCH RESULTS FOR: {result.query}")
+    print(f"Found {result.total_results} results in {result.processing_time:.2f} seconds")
+    print(f"{'='*80}")
+
+    # Show search results
+    print("\nSEARCH RESULTS:")
+    for i, search_result in enumerate(result.search_results, 1):
+        print(f"\n{i}. {search_result.title}")
+        print(f"   🔗 {search_result.link}")
+        print(f"   📝 {search_result.snippet}")
+
+    # Show AI Overview
+    print(f"\n{'='*80}")
+    print("AI OVERVIEW")
+    print(f"Confidence Score: {result.ai_overview.confidence_score:.1f}/1.0")
+    print(f"{'='*80}")
+    print(f"\n{result.ai_overview.summary}")
+
+    print(f"\nKEY POINTS:")
+    for i, point in enumerate(result.ai_overview.key_points, 1):
+        print(f"{i}. {point}")
+
+    # Show Statistics
+    if result.ai_overview.statistics:
+        print(f"\n{'='*80}")
+        print("📊 EXTRACTED STATISTICS")
+        print(f"{'='*80}")
+        for i, stat in enumerate(result.ai_overview.statistics, 1):
+            unit_str = f" {stat.unit}" if stat.unit else ""
+            print(f"{i}. {stat.value}{unit_str} - {stat.context}")
+            print(f"   Source: {stat.source_citation} | Confidence: {stat.confidence:.1f}/1.0")
+
+    # Show Key Findings
+    if result.ai_overview.key_findings:
+        print(f"\n{'='*80}")
+        print("🔍 KEY RESEARCH FINDINGS")
+        print(f"{'='*80}")
+        for i, finding in enumerate(result.ai_overview.key_findings, 1):
+            print(f"{i}. [{finding.category}] {finding.finding}")
+            print(f"   Significance: {finding.significance}")
+            print(f"   Evidence: {finding.supporting_evidence}")
+            if finding.limitations:
+                print(f"   Limitations: {finding.limitations}")
+            print()
+
+    # Show Research Quality Assessment
+    quality = result.ai_overview.research_quality
+    if quality.academic_paper_count > 0 or quality.source_types:
+        print(f"\n{'='*80}")
+        print("📚 RESEARCH QUALITY ASSESSMENT")
+        print(f"{'='*80}")
+        print(f"Academic Papers Found: {quality.academic_paper_count}")
+        if quality.source_types:
+            print(f"Source Types: {', '.join(quality.source_types)}")
+        if quality.publication_years:
+            print(f"Publication Years: {min(quality.publication_years)}-{max(quality.publication_years)}")
+        if quality.study_methodologies:
+            print(f"Study Methods: {', '.join(quality.study_methodologies)}")
+        if quality.sample_sizes:
+            print(f"Sample Sizes: {', '.join(quality.sample_sizes)}")
+
+    # Show Methodology Notes
+    if result.ai_overview.methodology_notes:
+        print(f"\n📋 METHODOLOGY NOTES:")
+        print(f"{result.ai_overview.methodology_notes}")
+
+    # Show Future Research Directions
+    if result.ai_overview.future_research_directions:
+        print(f"\n🔬 FUTURE RESEARCH DIRECTIONS:")
+        print(f"{result.ai_overview.future_research_directions}")
+
+    # Show sources
+    print(f"\n{'='*80}")
+    print("SOURCES")
+    print(f"{'='*80}")
+    for source in result.sources:
+        print(f"[{source.source_number}] {source.title}")
+        print(f"    {source.link}")
+    print(f"\n{'='*80}\n")
+
+# Bytes read from stdin past the last line handed out, e.g. the rest of a multi-line paste
+_STDIN_PENDING = bytearray()
+
+def _take_stdin_line(final: bool = False) -> Optional[str]:
+    """Pop the next complete line from the pending stdin bytes (or the unterminated tail at EOF)"""
+    newline = _STDIN_PENDING.find(b"\n")
+    if newline < 0:
+        if not (final and _STDIN_PENDING):
+            return None
+        newline = len(_STDIN_PENDING)
+    line = bytes(_STDIN_PENDING[:newline])
+    del _STDIN_PENDING[:newline + 1]
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+
+async def _ainput(prompt: str) -> str:
+    """Read a line from stdin on the event loop, so Ctrl+C cancels the wait and no thread is left blocked on exit"""
+    print(prompt, end="", flush=True)
+    line = _take_stdin_line()
+    if line is not None:
+        return line
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    fd = sys.stdin.fileno()
+
+    def on_readable():
+        # Raw reads and our own line splitting: a buffered readline() would swallow later pasted lines
+        chunk = os.read(fd, 4096)
+        _STDIN_PENDING.extend(chunk)
+        line = _take_stdin_line(final=not chunk)
+        if future.done() or (line is None and chunk):
+            return
+        loop.remove_reader(fd)
+        if line is None:
+            future.set_exception(EOFError())
+        else:
+            future.set_result(line)
+
+    try:
+        loop.add_reader(fd, on_readable)
+    except (NotImplementedError, OSError):
+        # Loops without reader support (Windows) and unpollable stdin (a regular file) read on a worker thread
+        return await asyncio.to_thread(input)
+    try:
+        return await future
+    finally:
+        loop.remove_reader(fd)
+
 async def main():
     """Main application loop for interactive mode"""
     logger.info("Starting production search engine with RAG...")
 
-    # Health check
-    health = rag.health_check()
-    if health["status"] != "healthy":
-        logger.error(f"System health check failed: {health}")
-        print("System is not ready. Check logs for details.")
-        return
-
-    logger.info("System health check passed. Ready for queries.")
-    print("🚀 Production Search Engine with RAG is ready!")
-    print("Type 'exit' or 'quit' to stop.\n")
-
-    while True:
+    # Health check (which also loads the embedding model) runs while the crawler's browser starts
+    crawler_task = asyncio.create_task(get_crawler())
+    try:
         try:
-            user_input = input("What would you like to search for? ")
+            health = await asyncio.to_thread(lambda: get_rag().health_check())
+        except Exception as e:
+            health = {"status": "unhealthy", "error": str(e)}
+        finally:
+            # Let the browser finish starting either way so shutdown() below closes it
+            try:
+                await crawler_task
+            except Exception as e:
+                logger.warning(f"Could not pre-start web crawler: {e}")
 
-            if user_input.lower() in ['exit', 'quit']:
-                logger.info("User requested exit")
-                break
+        if health["status"] != "healthy":
+            logger.error(f"System health check failed: {health}")
+            print("System is not ready. Check logs for details.")
+            return
 
-            if not user_input or len(user_input.strip()) < 2:
-                print("⚠️ Please enter a valid search query (at least 2 characters)")
-                continue
+        logger.info("System health check passed. Ready for queries.")
+        print("🚀 Production Search Engine with RAG is ready!")
+        print("Type 'exit' or 'quit' to stop.\n")
 
+        while True:
             try:
-                # Process the search query
-                result = await process_search_query(user_input)
-
-                # Display results in Google-style format
-                print(f"\n{'='*80}")
-                print(f"SEARCH RESULTS FOR: {result.query}")
-                print(f"Found {result.total_results} results in {result.processing_time:.2f} seconds")
-                print(f"{'='*80}")
-
-                # Show search results
-                print("\nSEARCH RESULTS:")
-                for i, search_result in enumerate(result.search_results, 1):
-                    print(f"\n{i}. {search_result.title}")
-                    print(f"   🔗 {search_result.link}")
-                    print(f"   📝 {search_result.snippet}")
-
-                # Show AI Overview
-                print(f"\n{'='*80}")
-                print("AI OVERVIEW")
-                print(f"Confidence Score: {result.ai_overview.confidence_score:.1f}/1.0")
-                print(f"{'='*80}")
-                print(f"\n{result.ai_overview.summary}")
-
-                print(f"\nKEY POINTS:")
-                for i, point in enumerate(result.ai_overview.key_points, 1):
-                    print(f"{i}. {point}")
-
-                # Show Statistics
-                if result.ai_overview.statistics:
-                    print(f"\n{'='*80}")
-                    print("📊 EXTRACTED STATISTICS")
-                    print(f"{'='*80}")
-                    for i, stat in enumerate(result.ai_overview.statistics, 1):
-                        unit_str = f" {stat.unit}" if stat.unit else ""
-                        print(f"{i}. {stat.value}{unit_str} - {stat.context}")
-                        print(f"   Source: {stat.source_citation} | Confidence: {stat.confidence:.1f}/1.0")
-
-                # Show Key Findings
-                if result.ai_overview.key_findings:
-                    print(f"\n{'='*80}")
-                    print("🔍 KEY RESEARCH FINDINGS")
-                    print(f"{'='*80}")
-                    for i, finding in enumerate(result.ai_overview.key_findings, 1):
-                        print(f"{i}. [{finding.category}] {finding.finding}")
-                        print(f"   Significance: {finding.significance}")
-                        print(f"   Evidence: {finding.supporting_evidence}")
-                        if finding.limitations:
-                            print(f"   Limitations: {finding.limitations}")
-                        print()
-
-                # Show Research Quality Assessment
-                quality = result.ai_overview.research_quality
-                if quality.academic_paper_count > 0 or quality.source_types:
-                    print(f"\n{'='*80}")
-                    print("📚 RESEARCH QUALITY ASSESSMENT")
-                    print(f"{'='*80}")
-                    print(f"Academic Papers Found: {quality.academic_paper_count}")
-                    if quality.source_types:
-                        print(f"Source Types: {', '.join(quality.source_types)}")
-                    if quality.publication_years:
-                        print(f"Publication Years: {min(quality.publication_years)}-{max(quality.publication_years)}")
-                    if quality.study_methodologies:
-                        print(f"Study Methods: {', '.join(quality.study_methodologies)}")
-                    if quality.sample_sizes:
-                        print(f"Sample Sizes: {', '.join(quality.sample_sizes)}")
-
-                # Show Methodology Notes
-                if result.ai_overview.methodology_notes:
-                    print(f"\n📋 METHODOLOGY NOTES:")
-                    print(f"{result.ai_overview.methodology_notes}")
-
-                # Show Future Research Directions
-                if result.ai_overview.future_research_directions:
-                    print(f"\n🔬 FUTURE RESEARCH DIRECTIONS:")
-                    print(f"{result.ai_overview.future_research_directions}")
-
-                # Show sources
-                print(f"\n{'='*80}")
-                print("SOURCES")
-                print(f"{'='*80}")
-                for source in result.sources:
-                    print(f"[{source.source_number}] {source.title}")
-                    print(f"    {source.link}")
-                print(f"\n{'='*80}\n")
+                user_input = await _ainput("What would you like to search for? ")
 
-            except Exception as e:
-                logger.error(f"Error processing search: {e}")
-                print("Search processing failed. Please try again.")
+                if user_input.lower() in ['exit', 'quit']:
+                    logger.info("User requested exit")
+                    break
 
-        except KeyboardInterrupt:
-            logger.info("User interrupted with Ctrl+C")
-            print("\nGoodbye!")
-            break
+                if not user_input or len(user_input.strip()) < 2:
+                    print("⚠️ Please enter a valid search query (at least 2 characters)")
+                    continue
 
-        except Exception as e:
-            logger.error(f"Unexpected error in main loop: {e}")
-            print("An unexpected error occurred. Please try again.")
-            continue
+                try:
+                    # Process the search query
+                    result = await process_search_query(user_input)
+
+                    # Render off the event loop so background tasks keep running while the terminal drains
+                    await asyncio.to_thread(_print_results, result)
+
+                except Exception as e:
+                    logger.error(f"Error processing search: {e}")
+                    print("Search processing failed. Please try again.")
 
-    logger.info("Search engine stopped")
+            # asyncio.run turns Ctrl+C into cancellation of this task; EOF (Ctrl+D) exits the same way
+            except (KeyboardInterrupt, asyncio.CancelledError, EOFError):
+                logger.info("User interrupted with Ctrl+C")
+                print("\nGoodbye!")
+                break
+
+            except Exception as e:
+                logger.error(f"Unexpected error in main loop: {e}")
+                print("An unexpected error occurred. Please try again.")
+                continue
+    finally:
+        await shutdown()
+        logger.info("Search engine stopped")
 
 def run_main():
     asyncio.run(main())
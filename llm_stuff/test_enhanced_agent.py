@@ -3,35 +3,46 @@
 Test script for enhanced statistics extraction and research-backed summary features
 """
 
+import sys
+from typing import List
 from serper import (
     Statistic, KeyFinding, ResearchQuality, AIOverview,
-    SearchResult, SearchResponse, SearchContext
+    SearchResult, SearchResponse, SearchContext, _fallback_overview
 )
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
+
+_STATISTIC_LIST = TypeAdapter(List[Statistic])
+_KEY_FINDING_LIST = TypeAdapter(List[KeyFinding])
 
 def test_data_models():
     """Test that all new data models work correctly"""
     print("🧪 Testing enhanced data models...")
 
     try:
-        # Test Statistic model
-        stat = Statistic(
-            value=85.7,
-            unit="%",
-            context="Success rate in clinical trial",
-            source_citation="[1]",
-            confidence=0.9
-        )
+        # Test Statistic model (validated as a batch in one call)
+        stats = _STATISTIC_LIST.validate_python([
+            {
+                "value": 85.7,
+                "unit": "%",
+                "context": "Success rate in clinical trial",
+                "source_citation": "[1]",
+                "confidence": 0.9
+            }
+        ])
+        stat = stats[0]
         print(f"✅ Statistic model: {stat.value}{stat.unit} - {stat.context}")
 
-        # Test KeyFinding model
-        finding = KeyFinding(
-            finding="Treatment showed significant improvement",
-            category="Clinical Trial Result",
-            significance="Represents breakthrough in treatment effectiveness",
-            supporting_evidence="Double-blind randomized controlled trial with 500 participants [1]",
-            limitations="Study limited to adult population"
-        )
+        # Test KeyFinding model (validated as a batch in one call)
+        findings = _KEY_FINDING_LIST.validate_python([
+            {
+                "finding": "Treatment showed significant improvement",
+                "category": "Clinical Trial Result",
+                "significance": "Represents breakthrough in treatment effectiveness",
+                "supporting_evidence": "Double-blind randomized controlled trial with 500 participants [1]",
+                "limitations": "Study limited to adult population"
+            }
+        ])
+        finding = findings[0]
         print(f"✅ KeyFinding model: [{finding.category}] {finding.finding}")
 
         # Test ResearchQuality model
@@ -48,8 +59,8 @@ def test_data_models():
         overview = AIOverview(
             summary="Enhanced summary with statistics and findings",
             key_points=["Point 1 [1]", "Point 2 [2]"],
-            statistics=[stat],
-            key_findings=[finding],
+            statistics=stats,
+            key_findings=findings,
             research_quality=quality,
             confidence_score=0.85,
             methodology_notes="High-quality randomized trials",
@@ -68,26 +79,12 @@ def test_data_models():
         return False
 
 def test_fallback_overview():
-    """Test the fallback AIOverview creation"""
+    """Test that the unvalidated fallback AIOverview still passes full validation"""
     print("\n🧪 Testing fallback AIOverview...")
 
     try:
-        fallback = AIOverview(
-            summary="Fallback summary for testing",
-            key_points=["Fallback point 1", "Fallback point 2"],
-            statistics=[],
-            key_findings=[],
-            research_quality=ResearchQuality(
-                source_types=["web search results"],
-                academic_paper_count=0,
-                publication_years=[],
-                study_methodologies=[],
-                sample_sizes=[]
-            ),
-            confidence_score=0.3,
-            methodology_notes="Analysis limited due to processing error",
-            future_research_directions=None
-        )
+        fallback = _fallback_overview("test query", "Analysis limited due to processing error")
+        AIOverview.model_validate(fallback.model_dump())
         print(f"✅ Fallback AIOverview created successfully with confidence: {fallback.confidence_score}")
         return True
 
@@ -96,6 +93,9 @@ def test_fallback_overview():
         return False
 
 if __name__ == "__main__":
+    # Buffer output and write it in one flush at the end instead of a write per line
+    sys.stdout.reconfigure(line_buffering=False)
+
     print("🚀 Testing Enhanced Pydantic AI Agent Features\n")
 
     # Run tests
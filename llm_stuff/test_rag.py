@@ -3,38 +3,57 @@
 Test script for RAG-enhanced search engine
 """
 
+import os
 import asyncio
-from serper import get_header_link_snippet_from_user_query, get_markdown_from_urls, final_agent, SearchContext
+from serper import get_header_link_snippet_from_user_query, iter_markdown_from_urls, final_agent, SearchContext, shutdown
 from rag_module import RAGModule
 
-async def test_rag_search(query: str):
+# Crawled pages handed to RAG per embedding batch
+INGEST_BATCH_SIZE = 4
+
+# Queries allowed in flight at once, matching the Serper/LLM rate budget
+QUERY_CONCURRENCY = int(os.getenv("RAG_TEST_CONCURRENCY", "2"))
+
+async def test_rag_search(query: str, rag: RAGModule, query_embedding=None):
     """Test the RAG-enhanced search with a specific query"""
 
     print(f"🔍 Testing RAG search with query: '{query}'\n")
 
-    # Initialize RAG module
-    rag = RAGModule()
-
     # Get search results
     print("📊 Getting search results...")
-    search_results = get_header_link_snippet_from_user_query(query)
+    search_results = await get_header_link_snippet_from_user_query(query)
     headers = search_results['headers']
     links = search_results['links']
     snippets = search_results['snippets']
 
     print(f"Found {len(headers)} search results")
 
-    # Get markdown content
-    print("🕷️ Crawling content...")
-    markdown_contents = await get_markdown_from_urls(links)
-
-    # Add research papers to RAG
-    print("🧠 Processing research papers for RAG...")
-    rag.add_documents(search_results, markdown_contents)
+    # Crawl content, adding each small batch of finished pages to RAG while the rest are still in flight
+    print("🕷️ Crawling content and processing research papers for RAG...")
+    markdown_contents = [""] * len(links)
+    batch = []
+
+    async def ingest(indices):
+        batch_results = {
+            "headers": [headers[i] for i in indices],
+            "links": [links[i] for i in indices],
+            "snippets": [snippets[i] for i in indices]
+        }
+        await asyncio.to_thread(rag.add_documents, batch_results, [markdown_contents[i] for i in indices])
+
+    async for index, markdown_content in iter_markdown_from_urls(links):
+        markdown_contents[index] = markdown_content
+        batch.append(index)
+        if len(batch) == INGEST_BATCH_SIZE:
+            await ingest(batch)
+            batch = []
+    if batch:
+        await ingest(batch)
 
     # Get RAG context
     print("📚 Retrieving relevant research papers...")
-    rag_context = rag.get_rag_context(query)
+    # Qdrant search is synchronous; run it off the loop so the other queries' crawls and LLM calls keep going
+    rag_context = await asyncio.to_thread(rag.get_rag_context, query, query_embedding=query_embedding)
 
     if rag_context:
         print("✅ Found relevant research papers!")
@@ -43,11 +62,13 @@ async def test_rag_search(query: str):
         print("⚠️ No research papers found in search results\n")
 
     # Combine all content
-    combined_content = ""
-    for header, link, snippet, markdown_content in zip(headers, links, snippets, markdown_contents):
-        combined_content += f"Header: {header}\nLink: {link}\nSnippet: {snippet}\nContent: {markdown_content}\n\n"
+    combined_content = "".join(
+        f"Header: {header}\nLink: {link}\nSnippet: {snippet}\nContent: {markdown_content}\n\n"
+        for header, link, snippet, markdown_content in zip(headers, links, snippets, markdown_contents)
+    )
 
-    # Create search context
+    # Create search context; one per query, since queries run concurrently and the
+    # slotted dataclass costs no validation to build
     search_context = SearchContext(
         query=query,
         combined_content=combined_content,
@@ -85,20 +106,34 @@ async def main():
         "quantum computing applications"
     ]
 
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n{'🔬' * 20} TEST {i} {'🔬' * 20}")
-        success = await test_rag_search(query)
+    try:
+        # Load the embedding model and connect to Qdrant once for all queries
+        rag = RAGModule()
+
+        # Embed every test query in one batch up front so retrieval doesn't re-encode them
+        query_embeddings = dict(zip(test_queries, rag.model.encode(test_queries)))
+
+        # Each test is dominated by network waits, so run them concurrently up to the rate budget
+        semaphore = asyncio.Semaphore(QUERY_CONCURRENCY)
+
+        async def limited_search(query: str):
+            async with semaphore:
+                return await test_rag_search(query, rag, query_embeddings[query])
 
-        if success:
-            print(f"✅ Test {i} completed successfully")
-        else:
-            print(f"❌ Test {i} failed")
+        results = await asyncio.gather(*(limited_search(query) for query in test_queries), return_exceptions=True)
 
-        if i < len(test_queries):
-            print("\n" + "⏳ Waiting 2 seconds before next test...\n")
-            await asyncio.sleep(2)
+        for i, success in enumerate(results, 1):
+            if isinstance(success, Exception):
+                print(f"❌ Test {i} failed: {success}")
+            elif success:
+                print(f"✅ Test {i} completed successfully")
+            else:
+                print(f"❌ Test {i} failed")
 
-    print(f"\n{'🎉' * 20} TESTS COMPLETE {'🎉' * 20}")
+        print(f"\n{'🎉' * 20} TESTS COMPLETE {'🎉' * 20}")
+    finally:
+        # Close the shared crawler and HTTP client before asyncio.run tears down the loop
+        await shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file